@@ -1,8 +1,11 @@
 # algorithm.py - Different scheduling algorithms
 
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+import numpy as np
+
 import config
-from scheduler import Task
+from scheduler import Task, SJF_KEY, PRIO_KEY, GREEN_KEY
 
 
 class SchedulingAlgorithm:
@@ -19,6 +22,46 @@ class SchedulingAlgorithm:
         """Return next task to execute (must be implemented in subclasses)"""
         raise NotImplementedError
 
+    def build_queue(self, tasks: List[Task]) -> List[Task]:
+        """Return the ready queue consumed by select()"""
+        return list(tasks)
+
+    def select(self, queue: List[Task]) -> Task:
+        """Remove and return next task from a queue built by build_queue()"""
+        task = self.schedule(queue)
+        if task is not None:
+            # Find it by identity: list.remove() would call the dataclass
+            # __eq__ on every task before it. Delete by position rather than
+            # swap-pop, since schedule() may depend on the queue's order.
+            idx = next((i for i, t in enumerate(queue) if t is task), None)
+            if idx is None:
+                raise ValueError("schedule() returned a task not in the queue")
+            del queue[idx]
+        return task
+
+    def execution_order(self, arrays: Dict[str, np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Return the full execution order as task indices, computed from the
+        task arrays (see Simulator), or None if the order can only be
+        found step by step through select().
+        """
+        return None
+
+    def has_execution_order(self) -> bool:
+        """
+        True if execution_order() reflects this scheduler's behaviour, i.e.
+        schedule() and execute_task() are not overridden below the class
+        that implements execution_order().
+        """
+        cls = type(self)
+        owner = next(c for c in cls.__mro__ if "execution_order" in c.__dict__)
+        if owner is SchedulingAlgorithm:
+            return False
+        return (
+            cls.schedule is owner.schedule
+            and cls.execute_task is owner.execute_task
+        )
+
     def execute_task(self, task: Task, current_time: float, power_watts: float) -> None:
         """Record task execution and update metrics"""
         task.start_time = current_time
@@ -30,6 +73,24 @@ class SchedulingAlgorithm:
         self.total_wait_time += task.get_wait_time()
         self.total_turnaround_time += task.get_turnaround_time()
 
+    def execute_batch(
+        self,
+        tasks: List[Task],
+        start_times: np.ndarray,
+        end_times: np.ndarray,
+        arrival_times: np.ndarray,
+        energy_kwh: np.ndarray,
+    ) -> None:
+        """Record a whole execution sequence at once (vectorized execute_task)"""
+        for task, start, end in zip(tasks, start_times.tolist(), end_times.tolist()):
+            task.start_time = start
+            task.end_time = end
+        self.executed_tasks.extend(tasks)
+
+        self.total_energy += float(energy_kwh.sum())
+        self.total_wait_time += float((start_times - arrival_times).sum())
+        self.total_turnaround_time += float((end_times - arrival_times).sum())
+
     def get_average_wait_time(self) -> float:
         if self.executed_tasks:
             return self.total_wait_time / len(self.executed_tasks)
@@ -63,6 +124,9 @@ class FCFSScheduler(SchedulingAlgorithm):
             return tasks[0]
         return None
 
+    def execution_order(self, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.arange(len(arrays["duration"]))
+
 
 class SJFScheduler(SchedulingAlgorithm):
     """Shortest Job First"""
@@ -73,7 +137,10 @@ class SJFScheduler(SchedulingAlgorithm):
     def schedule(self, tasks: List[Task]) -> Task:
         if not tasks:
             return None
-        return min(tasks, key=lambda t: t.duration)
+        return min(tasks, key=SJF_KEY)
+
+    def execution_order(self, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.argsort(arrays["duration"], kind="stable")
 
 
 class PriorityScheduler(SchedulingAlgorithm):
@@ -86,7 +153,11 @@ class PriorityScheduler(SchedulingAlgorithm):
         if not tasks:
             return None
         # Lower priority.value = higher priority
-        return min(tasks, key=lambda t: (t.priority.value, t.arrival_time))
+        return min(tasks, key=PRIO_KEY)
+
+    def execution_order(self, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        # lexsort sorts by the last key first and is stable
+        return np.lexsort((arrays["arrival"], arrays["priority"]))
 
 
 class RoundRobinScheduler(SchedulingAlgorithm):
@@ -101,6 +172,9 @@ class RoundRobinScheduler(SchedulingAlgorithm):
             return tasks[0]
         return None
 
+    def execution_order(self, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.arange(len(arrays["duration"]))
+
 
 class EnergyOptimizedScheduler(SchedulingAlgorithm):
     """Energy-Optimized (Green) Scheduling"""
@@ -118,11 +192,10 @@ class EnergyOptimizedScheduler(SchedulingAlgorithm):
             return None
 
         # First by CPU requirement (lower first), then by priority, then by arrival
-        sorted_tasks = sorted(
-            tasks,
-            key=lambda t: (t.cpu_requirement, t.priority.value, t.arrival_time),
-        )
-        return sorted_tasks[0]
+        return min(tasks, key=GREEN_KEY)
+
+    def execution_order(self, arrays: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.lexsort((arrays["arrival"], arrays["priority"], arrays["cpu"]))
 
     def apply_dvfs(self, current_power_watts: float, cpu_usage: float) -> float:
         """
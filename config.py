@@ -10,6 +10,7 @@ NUM_TASKS = 20 # Number of tasks to schedule
 TASK_DURATION_MIN = 0.5 # Min task duration (seconds)
 TASK_DURATION_MAX = 5.0 # Max task duration (seconds)
 TASK_PRIORITY_LEVELS = 3 # High, Medium, Low
+RANDOM_SEED = None # Set an int for reproducible task sets (NumPy generator seed)
 # Energy conversion factors (India)
 EMISSION_FACTOR_KG_CO2_PER_KWH = 0.73 # kg CO2 per kWh in India
 POWER_COST_PER_KWH = 8.0 # ₹ per kWh (approximate)
@@ -23,4 +24,5 @@ SAMPLING_INTERVAL = 1 # Collect data every N seconds
 # Output settings
 ENABLE_LOGGING = True
 ENABLE_VISUALIZATION = True
+FUSED_VISUALIZATION = False # One 2x2 chart image instead of three separate ones
 SAVE_RESULTS = True
@@ -1,8 +1,108 @@
 # energy_monitor.py - Monitor system energy consumption
 
+import ctypes
+import os
+import sys
+import time
+from array import array
+from datetime import datetime
+
+import numpy as np
 import psutil
+
 import config
-from datetime import datetime
+
+# Minimum time (seconds) between two psutil reads of the same metric
+MIN_POLL_INTERVAL = 0.25
+
+# Power model / conversion constants derived once from config
+_BASE_POWER_WATTS = config.BASE_POWER_WATTS
+_POWER_RANGE_WATTS = config.MAX_POWER_WATTS - config.BASE_POWER_WATTS
+_CO2_PER_KWH = config.EMISSION_FACTOR_KG_CO2_PER_KWH
+_COST_PER_KWH = config.POWER_COST_PER_KWH
+
+_CLOCK_MONOTONIC = 1
+
+
+def _cpu_busy_total(times) -> tuple:
+    """(busy, total) CPU seconds from a psutil.cpu_times() snapshot"""
+    total = sum(times)
+    # On Linux guest time is already counted in user/nice
+    total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    return total - idle, total
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class _Itimerspec(ctypes.Structure):
+    _fields_ = [("it_interval", _Timespec), ("it_value", _Timespec)]
+
+
+class PeriodicTicker:
+    """
+    Fixed-rate pacing for sampling loops.
+
+    On Linux a timerfd (CLOCK_MONOTONIC) fires every interval and wait()
+    blocks on it, so ticks don't drift like repeated time.sleep() calls.
+    Elsewhere it sleeps until the next absolute deadline.
+    """
+
+    def __init__(self, interval_s: float):
+        # A zero timerfd interval disarms the timer and wait() would block forever
+        if round(interval_s * 1e9) <= 0:
+            raise ValueError(f"interval_s must be at least 1 ns, got {interval_s!r}")
+        self.interval_s = interval_s
+        self._fd = None
+        self._next_deadline = time.monotonic() + interval_s
+
+        if sys.platform.startswith("linux"):
+            try:
+                self._fd = self._open_timerfd(interval_s)
+            except (OSError, AttributeError):
+                self._fd = None
+
+    @staticmethod
+    def _open_timerfd(interval_s: float) -> int:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.timerfd_create(_CLOCK_MONOTONIC, 0)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "timerfd_create failed")
+
+        sec, nsec = divmod(round(interval_s * 1e9), 1_000_000_000)
+        period = _Timespec(sec, nsec)
+        spec = _Itimerspec(period, period)
+        if libc.timerfd_settime(fd, 0, ctypes.byref(spec), None) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, "timerfd_settime failed")
+        return fd
+
+    def wait(self) -> int:
+        """Block until the next tick. Returns ticks elapsed (>1 means missed ticks)"""
+        if self._fd is not None:
+            return int.from_bytes(os.read(self._fd, 8), sys.byteorder)
+
+        now = time.monotonic()
+        if now < self._next_deadline:
+            time.sleep(self._next_deadline - now)
+            now = time.monotonic()
+        ticks = int((now - self._next_deadline) // self.interval_s) + 1
+        self._next_deadline += ticks * self.interval_s
+        return ticks
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "PeriodicTicker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 class EnergyMonitor:
@@ -10,75 +110,134 @@ class EnergyMonitor:
 
     def __init__(self):
         self.readings = []
+        # Parallel arrays for energy integration (monotonic ns, watts)
+        self._ts_ns = array("q")
+        self._power = array("d")
+        # Wall-clock start, for display only; readings use time.monotonic_ns()
         self.start_time = datetime.now()
         self.total_energy_kwh = 0.0
         self.total_co2_kg = 0.0
         self.total_cost_inr = 0.0
 
+        # Cached psutil reads (see MIN_POLL_INTERVAL)
+        self._last_cpu_pct = 0.0
+        self._last_cpu_pct_ts = None
+        self._last_cpu_freq_ghz = config.MAX_FREQUENCY_GHZ
+        self._last_cpu_freq_ts = None
+
+        # Per-monitor CPU times baseline, so monitors don't share
+        # psutil.cpu_percent()'s process-wide one. Taken on the first read.
+        self._cpu_times = None
+
+    def _read_cpu_percent(self) -> float:
+        """
+        CPU usage since the previous read. Never blocks: the first read has
+        no baseline yet and reports the average since boot instead.
+        """
+        busy, total = _cpu_busy_total(psutil.cpu_times())
+        prev_busy, prev_total = self._cpu_times or (0.0, 0.0)
+        self._cpu_times = (busy, total)
+
+        total_delta = total - prev_total
+        if total_delta <= 0:
+            return 0.0
+        return min(max((busy - prev_busy) / total_delta * 100.0, 0.0), 100.0)
+
     def get_cpu_usage(self) -> float:
-        """Get current CPU usage percentage"""
-        return psutil.cpu_percent(interval=0.1)
+        """Get current CPU usage percentage (cached for MIN_POLL_INTERVAL)"""
+        now = time.monotonic()
+        if self._last_cpu_pct_ts is not None and now - self._last_cpu_pct_ts < MIN_POLL_INTERVAL:
+            return self._last_cpu_pct
+
+        self._last_cpu_pct = self._read_cpu_percent()
+        self._last_cpu_pct_ts = time.monotonic()
+        return self._last_cpu_pct
 
     def get_memory_usage(self) -> float:
         """Get current memory usage percentage"""
         return psutil.virtual_memory().percent
 
     def get_cpu_freq_ghz(self) -> float:
-        """Get current CPU frequency in GHz"""
+        """Get current CPU frequency in GHz (cached)"""
+        # psutil.cpu_freq() reads sysfs for every core and can be slow on big machines
+        now = time.monotonic()
+        if self._last_cpu_freq_ts is not None and now - self._last_cpu_freq_ts < MIN_POLL_INTERVAL:
+            return self._last_cpu_freq_ghz
+
+        freq_ghz = config.MAX_FREQUENCY_GHZ
         try:
             freq = psutil.cpu_freq()
             if freq:
-                return freq.current / 1000.0  # MHz -> GHz
+                freq_ghz = freq.current / 1000.0  # MHz -> GHz
         except Exception:
-            return config.MAX_FREQUENCY_GHZ
-        return config.MAX_FREQUENCY_GHZ
+            pass
+
+        self._last_cpu_freq_ghz = freq_ghz
+        self._last_cpu_freq_ts = now
+        return freq_ghz
 
-    def calculate_power_watts(self, cpu_usage_percent: float) -> float:
+    @staticmethod
+    def calculate_power_watts(cpu_usage_percent: float) -> float:
         """
         Calculate power consumption based on CPU usage.
+        Also accepts a NumPy array of CPU percentages.
 
         Linear model:
         Power = Base + (Max - Base) * (CPU% / 100)
         """
         power = (
-            config.BASE_POWER_WATTS
-            + (config.MAX_POWER_WATTS - config.BASE_POWER_WATTS) * (cpu_usage_percent / 100.0)
+            _BASE_POWER_WATTS
+            + _POWER_RANGE_WATTS * (cpu_usage_percent / 100.0)
         )
         return power
 
     def calculate_co2_emissions(self, energy_kwh: float) -> float:
         """Calculate CO₂ emissions (kg CO₂e) from energy in kWh"""
-        return energy_kwh * config.EMISSION_FACTOR_KG_CO2_PER_KWH
+        return energy_kwh * _CO2_PER_KWH
 
     def calculate_energy_cost(self, energy_kwh: float) -> float:
         """Calculate cost of energy consumed in INR"""
-        return energy_kwh * config.POWER_COST_PER_KWH
+        return energy_kwh * _COST_PER_KWH
 
     def record_reading(self, cpu_usage: float, memory_usage: float, power_watts: float) -> None:
         """Record a snapshot of system metrics"""
+        t_ns = time.monotonic_ns()
         reading = {
-            "timestamp": datetime.now(),
+            "t_ns": t_ns,
             "cpu_usage": cpu_usage,
             "memory_usage": memory_usage,
             "power_watts": power_watts,
         }
         self.readings.append(reading)
+        self._ts_ns.append(t_ns)
+        self._power.append(power_watts)
 
-    def get_total_energy_kwh(self) -> float:
-        """Calculate total energy consumption (kWh) from all readings"""
-        total_joules = 0.0
+    def sample_system(self, duration_s: float, interval_s: float = config.SAMPLING_INTERVAL) -> None:
+        """Record live CPU/memory/power readings every interval_s for duration_s"""
+        # The ticker validates interval_s before it is divided by
+        with PeriodicTicker(interval_s) as ticker:
+            num_samples = int(duration_s / interval_s)
 
-        # Need at least 2 readings to integrate over time
-        for i in range(len(self.readings) - 1):
-            current = self.readings[i]
-            next_reading = self.readings[i + 1]
+            # Restart the CPU baseline so each sample covers exactly one tick
+            self._read_cpu_percent()
+            for _ in range(num_samples):
+                ticker.wait()
+                # Uncached: get_cpu_usage() would repeat values below MIN_POLL_INTERVAL
+                cpu_usage = self._read_cpu_percent()
+                self.record_reading(
+                    cpu_usage=cpu_usage,
+                    memory_usage=self.get_memory_usage(),
+                    power_watts=self.calculate_power_watts(cpu_usage),
+                )
 
-            # Time elapsed between readings in seconds
-            time_delta = (next_reading["timestamp"] - current["timestamp"]).total_seconds()
+    def get_total_energy_kwh(self) -> float:
+        """Calculate total energy consumption (kWh) from all readings"""
+        ts_ns = np.asarray(self._ts_ns)
+        power = np.asarray(self._power)
 
-            # Energy (Joules) = Power (Watts) * Time (seconds)
-            energy_joules = current["power_watts"] * time_delta
-            total_joules += energy_joules
+        # Left-rectangle rule: each reading's power holds until the next one.
+        # Energy (Joules) = Power (Watts) * Time (seconds); needs 2+ readings.
+        total_joules = float(np.sum(power[:-1] * (np.diff(ts_ns) * 1e-9)))
 
         # Convert Joules to kWh (1 kWh = 3,600,000 J)
         self.total_energy_kwh = total_joules / 3_600_000.0
@@ -3,6 +3,7 @@
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from simulation import Simulator
 from visualization import DataVisualizer
@@ -47,12 +48,17 @@ def main() -> int:
 
         # Step 5: Visualize results
         print("\nStep 5: Creating visualizations...")
-        visualizer = DataVisualizer()
-        visualizer.generate_all_visualizations(results)
-
-        # Step 6: Save results
-        print("\nStep 6: Saving results...")
-        simulator.save_results()
+        # Charts, CSV and JSON are all written on this pool, concurrently
+        with ThreadPoolExecutor(max_workers=4) as writer:
+            visualizer = DataVisualizer(writer=writer)
+            visualizer.generate_all_visualizations(results, wait=False)
+
+            # Step 6: Save results
+            print("\nStep 6: Saving results...")
+            results_written = simulator.save_results(executor=writer)
+            visualizer.wait_for_writes()
+            print(f"\n✓ Results saved to {results_written.result()}")
+        visualizer.print_completion()
 
         print("\n" + "=" * 60)
         print("✓ SIMULATION COMPLETED SUCCESSFULLY!")
@@ -1,8 +1,9 @@
 # scheduler.py - Task and Scheduler classes
+import operator
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 import config
 
@@ -13,7 +14,7 @@ class TaskPriority(Enum):
     LOW = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single task to be scheduled"""
     task_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
@@ -24,6 +25,8 @@ class Task:
     end_time: Optional[float] = None
     cpu_requirement: float = 50.0  # CPU percentage needed (0-100)
     memory_requirement: float = 256.0  # Memory in MB
+    # Set in __post_init__ (slots=True: every attribute must be declared)
+    created_at: float = field(default=0.0, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.created_at = time.time()
@@ -51,27 +54,38 @@ class Task:
         return f"Task({self.task_id}, dur={self.duration:.2f}s, priority={self.priority.name})"
 
 
+# C-level key functions over the live Task fields (shared with algorithm.py)
+SJF_KEY = operator.attrgetter('duration')
+PRIO_KEY = operator.attrgetter('priority.value', 'arrival_time')
+GREEN_KEY = operator.attrgetter('cpu_requirement', 'priority.value', 'arrival_time')
+
+
 class TaskQueue:
     """Manages a queue of tasks"""
 
     def __init__(self):
+        # Add and remove tasks through add_task()/remove_task() so the
+        # ID index stays in sync with this list
         self.tasks: List[Task] = []
+        self._by_id: Dict[str, Task] = {}
 
     def add_task(self, task: Task) -> None:
-        """Add a task to the queue"""
+        """Add a task to the queue (task IDs must be unique)"""
+        if task.task_id in self._by_id:
+            raise ValueError(f"Duplicate task_id: {task.task_id}")
         self.tasks.append(task)
+        self._by_id[task.task_id] = task
 
     def remove_task(self, task: Task) -> None:
         """Remove a task from the queue"""
         if task in self.tasks:
             self.tasks.remove(task)
+            # Equal tasks share a task_id
+            self._by_id.pop(task.task_id, None)
 
     def get_task_by_id(self, task_id: str) -> Optional[Task]:
-        """Retrieve a specific task by ID"""
-        for task in self.tasks:
-            if task.task_id == task_id:
-                return task
-        return None
+        """Retrieve a specific task by ID (only tasks added via add_task)"""
+        return self._by_id.get(task_id)
 
     def get_next_task(self, algorithm: str) -> Optional[Task]:
         """Get next task based on scheduling algorithm"""
@@ -84,15 +98,16 @@ class TaskQueue:
 
         elif algorithm == 'SJF':
             # Return shortest task
-            return min(self.tasks, key=lambda t: t.duration)
+            return min(self.tasks, key=SJF_KEY)
 
         elif algorithm == 'PriorityBased':
             # Return highest priority task (lowest priority value)
-            return min(self.tasks, key=lambda t: (t.priority.value, t.arrival_time))
+            return min(self.tasks, key=PRIO_KEY)
 
         elif algorithm == 'EnergyOptimized':
-            # Return task with lowest energy requirement (CPU requirement)
-            return min(self.tasks, key=lambda t: t.cpu_requirement)
+            # Return task with lowest energy requirement (CPU requirement),
+            # tie-broken like EnergyOptimizedScheduler
+            return min(self.tasks, key=GREEN_KEY)
 
         # Default: FCFS
         return self.tasks[0]
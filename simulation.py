@@ -1,7 +1,9 @@
 # simulation.py - Run scheduling simulations
 
-import random
-from typing import List, Dict
+from concurrent.futures import Executor, Future
+from typing import List, Dict, Optional
+
+import numpy as np
 
 import config
 from scheduler import Task, TaskPriority
@@ -15,6 +17,15 @@ from algorithm import (
 from energy_monitor import EnergyMonitor
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json
+    orjson = None
+
+
+# Default for generate_random_tasks(seed=...): use config.RANDOM_SEED
+_CONFIG_SEED = object()
+
 
 class Simulator:
     """Main simulation engine"""
@@ -25,24 +36,60 @@ class Simulator:
         self.monitors: Dict[str, EnergyMonitor] = {}
         self.results: Dict[str, Dict] = {}
 
-    def generate_random_tasks(self, num_tasks: int = config.NUM_TASKS) -> List[Task]:
-        """Generate random tasks for simulation"""
-        self.tasks = []
+    def generate_random_tasks(self, num_tasks: int = config.NUM_TASKS,
+                              seed: Optional[int] = _CONFIG_SEED) -> List[Task]:
+        """
+        Generate random tasks for simulation.
+        Pass a seed (or set config.RANDOM_SEED) for a reproducible task set;
+        the stdlib random module's seed has no effect here.
+        """
+        if seed is _CONFIG_SEED:
+            # Read at call time so runtime changes to config are honoured
+            seed = config.RANDOM_SEED
 
-        for _ in range(num_tasks):
-            task = Task(
-                duration=random.uniform(config.TASK_DURATION_MIN, config.TASK_DURATION_MAX),
-                priority=random.choice(list(TaskPriority)),
-                arrival_time=random.uniform(0, config.SIMULATION_TIME / 2),
-                cpu_requirement=random.uniform(10, 100),
-            )
-            self.tasks.append(task)
+        # Sample every field in one vectorized call each
+        rng = np.random.default_rng(seed)
+        priorities = list(TaskPriority)
+        durations = rng.uniform(config.TASK_DURATION_MIN, config.TASK_DURATION_MAX, num_tasks)
+        priority_idx = rng.integers(0, len(priorities), num_tasks)
+        arrivals = rng.uniform(0, config.SIMULATION_TIME / 2, num_tasks)
+        cpus = rng.uniform(10, 100, num_tasks)
 
         # Sort by arrival time
-        self.tasks.sort(key=lambda t: t.arrival_time)
+        order = np.argsort(arrivals, kind="stable")
+        durations = durations[order]
+        priority_idx = priority_idx[order]
+        arrivals = arrivals[order]
+        cpus = cpus[order]
+
+        self.tasks = [
+            Task(
+                duration=d,
+                priority=priorities[p],
+                arrival_time=a,
+                cpu_requirement=c,
+            )
+            for d, p, a, c in zip(
+                durations.tolist(), priority_idx.tolist(), arrivals.tolist(), cpus.tolist()
+            )
+        ]
         print(f"Generated {num_tasks} tasks")
         return self.tasks
 
+    @staticmethod
+    def _build_task_arrays(tasks: List[Task]) -> Dict[str, np.ndarray]:
+        """Extract the task fields used for scheduling into NumPy arrays"""
+        n = len(tasks)
+        cpu = np.fromiter((t.cpu_requirement for t in tasks), float, n)
+        return {
+            "duration": np.fromiter((t.duration for t in tasks), float, n),
+            "cpu": cpu,
+            "priority": np.fromiter((t.priority.value for t in tasks), np.int64, n),
+            "arrival": np.fromiter((t.arrival_time for t in tasks), float, n),
+            # Power draw only depends on the CPU requirement: compute it once per run
+            "power": EnergyMonitor.calculate_power_watts(cpu),
+        }
+
     def initialize_schedulers(self) -> None:
         """Initialize all scheduling algorithms"""
         self.schedulers = {
@@ -59,17 +106,87 @@ class Simulator:
         scheduler = self.schedulers[algorithm_name]
         monitor = EnergyMonitor()
 
-        # Make a shallow copy of tasks list
-        remaining_tasks: List[Task] = [t for t in tasks]
+        # Rebuilt on every run so changes to the task list are always seen
+        arrays = self._build_task_arrays(tasks)
+
+        order = None
+        if scheduler.has_execution_order():
+            order = scheduler.execution_order(arrays)
+        if order is not None:
+            self._run_vectorized(scheduler, monitor, tasks, arrays, order)
+        else:
+            self._run_task_loop(scheduler, monitor, tasks, arrays)
+
+        # Store references
+        self.schedulers[algorithm_name] = scheduler
+        self.monitors[algorithm_name] = monitor
+
+        return scheduler.get_metrics()
+
+    def _run_vectorized(self, scheduler, monitor: EnergyMonitor, tasks: List[Task],
+                        arrays: Dict[str, np.ndarray], order: np.ndarray) -> None:
+        """Execute a precomputed (non-preemptive) order in one NumPy pass"""
+        durations = arrays["duration"][order]
+        start_times, end_times = self._timeline(durations, config.SIMULATION_TIME)
+
+        n = len(start_times)
+        order = order[:n]
+        durations = durations[:n]
+        cpu = arrays["cpu"][order]
+        power_watts = arrays["power"][order]
+        energy_kwh = power_watts * durations / (3600 * 1000)
+
+        scheduler.execute_batch(
+            [tasks[i] for i in order.tolist()],
+            start_times,
+            end_times,
+            arrays["arrival"][order],
+            energy_kwh,
+        )
+
+        # Record a reading per task (simplified: task's CPU requirement as usage)
+        for cpu_usage, power in zip(cpu.tolist(), power_watts.tolist()):
+            monitor.record_reading(
+                cpu_usage=cpu_usage,
+                memory_usage=30.0,  # dummy memory usage
+                power_watts=power,
+            )
+
+    @staticmethod
+    def _timeline(durations: np.ndarray, sim_time: float):
+        """
+        Run tasks back to back (in the given order) until the clock passes
+        sim_time. Returns the start and end time of every task that ran.
+        """
+        end_times = np.cumsum(durations)
+        start_times = np.empty_like(end_times)
+        start_times[:1] = 0.0
+        start_times[1:] = end_times[:-1]
+
+        # A task only starts while the clock is below sim_time
+        n = int(np.searchsorted(start_times, sim_time, side="left"))
+        return start_times[:n], end_times[:n]
+
+    def _run_task_loop(self, scheduler, monitor: EnergyMonitor, tasks: List[Task],
+                       arrays: Dict[str, np.ndarray]) -> None:
+        """Step through the ready queue one task at a time"""
+        power_by_task = dict(zip(map(id, tasks), arrays["power"].tolist()))
+
+        # Ready queue; select() pops the task chosen by schedule()
+        remaining_tasks = scheduler.build_queue(tasks)
         current_time = 0.0
 
-        while remaining_tasks and current_time < config.SIMULATION_TIME:
-            # Get next task to execute
-            next_task = scheduler.schedule(remaining_tasks)
+        # Loop-invariant lookups bound to locals
+        sim_time = config.SIMULATION_TIME
+        select = scheduler.select
+
+        while remaining_tasks and current_time < sim_time:
+            # Pop next task to execute
+            next_task = select(remaining_tasks)
 
             if next_task:
-                # Compute power based on this task's CPU requirement
-                power_watts = monitor.calculate_power_watts(next_task.cpu_requirement)
+                # Precomputed power for this task's CPU requirement
+                power_watts = power_by_task[id(next_task)]
 
                 # Execute task (update metrics)
                 scheduler.execute_task(next_task, current_time, power_watts)
@@ -81,19 +198,12 @@ class Simulator:
                     power_watts=power_watts,
                 )
 
-                # Update time and remove task from queue
+                # Update time
                 current_time += next_task.duration
-                remaining_tasks.remove(next_task)
             else:
                 # No task available, advance time slightly
                 current_time += 0.1
 
-        # Store references
-        self.schedulers[algorithm_name] = scheduler
-        self.monitors[algorithm_name] = monitor
-
-        return scheduler.get_metrics()
-
     def run_all_simulations(self) -> Dict[str, Dict]:
         """Run simulations for all algorithms"""
         print("\n" + "=" * 60)
@@ -118,14 +228,16 @@ class Simulator:
         print("ALGORITHM COMPARISON")
         print("=" * 60)
 
+        results = list(self.results.items())
+
         # Sort by energy
         sorted_by_energy = sorted(
-            self.results.items(),
+            results,
             key=lambda x: x[1]["total_energy_kwh"],
         )
         # Sort by CO2
         sorted_by_co2 = sorted(
-            self.results.items(),
+            results,
             key=lambda x: x[1]["co2_emissions_kg"],
         )
 
@@ -145,8 +257,27 @@ class Simulator:
 
         return best_energy_algo, best_co2_algo
 
-    def save_results(self, filename: str = "results/simulation_results.json") -> None:
-        """Save results to JSON file"""
-        with open(filename, "w") as f:
-            json.dump(self.results, f, indent=2)
+    def save_results(self, filename: str = "results/simulation_results.json",
+                     executor: Optional[Executor] = None) -> Optional[Future]:
+        """
+        Save results to JSON file.
+        If an executor is given the write runs there and its Future (resolving
+        to the filename) is returned; the caller reports it once it's done.
+        """
+        if executor is not None:
+            return executor.submit(self._write_results, filename, dict(self.results))
+        self._write_results(filename, self.results)
         print(f"\n✓ Results saved to {filename}")
+        return None
+
+    @staticmethod
+    def _write_results(filename: str, results: Dict[str, Dict]) -> str:
+        # orjson and json parse back to the same values but format small
+        # floats differently (positional vs exponent notation)
+        if orjson is not None:
+            with open(filename, "wb", buffering=1024 * 1024) as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, "w", buffering=1024 * 1024) as f:
+                json.dump(results, f, indent=2)
+        return filename
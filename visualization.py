@@ -1,130 +1,202 @@
 # visualization.py - Create graphs and charts
 
 import os
-from typing import Dict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import matplotlib.image as mpimg
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import pandas as pd
 
+import config
+
 
 class DataVisualizer:
     """Create visualizations for energy and performance analysis"""
 
-    def __init__(self):
+    def __init__(self, writer: Optional[Executor] = None):
         self.output_dir = "results"
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-    def plot_energy_comparison(self, results: Dict) -> None:
-        """Bar chart comparing energy consumption of each algorithm"""
-        algorithms = list(results.keys())
-        energy_values = [results[algo]["total_energy_kwh"] for algo in algorithms]
+        # PNG encoding and file writes run here, off the main thread.
+        # Without a writer, a pool is created on the first write and shut
+        # down again by wait_for_writes() (or close()).
+        self._owns_writer = writer is None
+        self.writer = writer
+        self._pending: List[Tuple[str, Future]] = []
+
+    def close(self) -> None:
+        """Wait for queued writes and shut down the writer pool if we created it"""
+        if self._owns_writer and self.writer is not None:
+            self.writer.shutdown(wait=True)
+            self.writer = None
+
+    def __enter__(self) -> "DataVisualizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _submit_write(self, filename: str, fn, *args, **kwargs) -> None:
+        """Queue a file write on the writer pool"""
+        if self.writer is None:
+            self.writer = ThreadPoolExecutor(max_workers=4)
+        self._pending.append((filename, self.writer.submit(fn, *args, **kwargs)))
+
+    @staticmethod
+    def _new_figure(nrows: int = 1, ncols: int = 1, figsize=(10, 6)):
+        """
+        Create a figure on the Agg canvas directly: no pyplot state, no GUI
+        backend probing, nothing to plt.close() afterwards.
+        """
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots(nrows, ncols, squeeze=True)
+
+    def _save_figure(self, fig: Figure, filename: str) -> None:
+        """
+        Render the figure here (matplotlib figures are not thread-safe),
+        then encode and write the PNG in the background.
+        """
+        fig.set_dpi(300)
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+        self._submit_write(filename, mpimg.imsave, filename, rgba, dpi=300)
+
+    def wait_for_writes(self) -> None:
+        """Block until all queued file writes are done (releasing an owned pool); raise if any failed"""
+        pending, self._pending = self._pending, []
+        failed = []
+        for filename, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                failed.append((filename, e))
+                print(f"✗ Failed: {filename} ({e})")
+            else:
+                print(f"✓ Saved: {filename}")
+        self.close()
+
+        if failed:
+            names = ", ".join(filename for filename, _ in failed)
+            raise RuntimeError(f"{len(failed)} file write(s) failed: {names}") from failed[0][1]
+
+    def print_completion(self) -> None:
+        """Print the end-of-visualization summary lines"""
+        print("\n✓ All visualizations completed!")
+        print(f"✓ Results saved to: {os.path.abspath(self.output_dir)}")
 
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(
+    @staticmethod
+    def _draw_labeled_bars(ax, algorithms, values, color: str, fmt: str) -> None:
+        """Bar chart with each bar's value printed on top"""
+        bars = ax.bar(
             algorithms,
-            energy_values,
-            color="#2ecc71",
+            values,
+            color=color,
             edgecolor="black",
             linewidth=1.5,
         )
 
         # Add labels on bars
-        for bar, value in zip(bars, energy_values):
+        for bar, value in zip(bars, values):
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 height,
-                f"{value:.6f}",
+                format(value, fmt),
                 ha="center",
                 va="bottom",
                 fontsize=10,
                 fontweight="bold",
             )
 
-        plt.title("Energy Consumption by Scheduling Algorithm", fontsize=14, fontweight="bold")
-        plt.xlabel("Algorithm", fontsize=12)
-        plt.ylabel("Energy (kWh)", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.grid(axis="y", alpha=0.3)
-        plt.tight_layout()
+    def _draw_energy(self, ax, results: Dict) -> None:
+        algorithms = list(results.keys())
+        energy_values = [results[algo]["total_energy_kwh"] for algo in algorithms]
 
-        filename = f"{self.output_dir}/01_energy_comparison.png"
-        plt.savefig(filename, dpi=300, bbox_inches="tight")
-        print(f"✓ Saved: {filename}")
-        plt.close()
+        self._draw_labeled_bars(ax, algorithms, energy_values, "#2ecc71", ".6f")
+        ax.set_title("Energy Consumption by Scheduling Algorithm", fontsize=14, fontweight="bold")
+        ax.set_xlabel("Algorithm", fontsize=12)
+        ax.set_ylabel("Energy (kWh)", fontsize=12)
+        ax.tick_params(axis="x", labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("right")
+        ax.grid(axis="y", alpha=0.3)
 
-    def plot_co2_comparison(self, results: Dict) -> None:
-        """Bar chart comparing CO₂ emissions of each algorithm"""
+    def _draw_co2(self, ax, results: Dict) -> None:
         algorithms = list(results.keys())
         co2_values = [results[algo]["co2_emissions_kg"] for algo in algorithms]
 
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(
-            algorithms,
-            co2_values,
-            color="#e74c3c",
-            edgecolor="black",
-            linewidth=1.5,
-        )
+        self._draw_labeled_bars(ax, algorithms, co2_values, "#e74c3c", ".4f")
+        ax.set_title("CO₂ Emissions by Scheduling Algorithm", fontsize=14, fontweight="bold")
+        ax.set_xlabel("Algorithm", fontsize=12)
+        ax.set_ylabel("CO₂ (kg CO₂e)", fontsize=12)
+        ax.tick_params(axis="x", labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("right")
+        ax.grid(axis="y", alpha=0.3)
+
+    @staticmethod
+    def _draw_time_metric(ax, results: Dict, metric: str, title: str, color: str) -> None:
+        algorithms = list(results.keys())
+        values = [results[algo][metric] for algo in algorithms]
 
-        for bar, value in zip(bars, co2_values):
-            height = bar.get_height()
-            plt.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height,
-                f"{value:.4f}",
-                ha="center",
-                va="bottom",
-                fontsize=10,
-                fontweight="bold",
-            )
+        ax.bar(algorithms, values, color=color, edgecolor="black")
+        ax.set_title(title, fontsize=12, fontweight="bold")
+        ax.set_ylabel("Time (seconds)", fontsize=11)
+        ax.tick_params(axis="x", rotation=45)
+        ax.grid(axis="y", alpha=0.3)
+
+    def plot_energy_comparison(self, results: Dict) -> None:
+        """Bar chart comparing energy consumption of each algorithm"""
+        fig, ax = self._new_figure(figsize=(10, 6))
+        self._draw_energy(ax, results)
+        fig.tight_layout()
 
-        plt.title("CO₂ Emissions by Scheduling Algorithm", fontsize=14, fontweight="bold")
-        plt.xlabel("Algorithm", fontsize=12)
-        plt.ylabel("CO₂ (kg CO₂e)", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.grid(axis="y", alpha=0.3)
-        plt.tight_layout()
+        filename = f"{self.output_dir}/01_energy_comparison.png"
+        self._save_figure(fig, filename)
+
+    def plot_co2_comparison(self, results: Dict) -> None:
+        """Bar chart comparing CO₂ emissions of each algorithm"""
+        fig, ax = self._new_figure(figsize=(10, 6))
+        self._draw_co2(ax, results)
+        fig.tight_layout()
 
         filename = f"{self.output_dir}/02_co2_comparison.png"
-        plt.savefig(filename, dpi=300, bbox_inches="tight")
-        print(f"✓ Saved: {filename}")
-        plt.close()
+        self._save_figure(fig, filename)
 
     def plot_performance_metrics(self, results: Dict) -> None:
         """Side-by-side charts for avg wait and turnaround time"""
-        algorithms = list(results.keys())
-
-        data = {
-            "Algorithm": algorithms,
-            "Avg Wait Time (s)": [results[algo]["avg_wait_time"] for algo in algorithms],
-            "Avg Turnaround (s)": [results[algo]["avg_turnaround_time"] for algo in algorithms],
-        }
+        fig, (ax1, ax2) = self._new_figure(1, 2, figsize=(14, 5))
 
-        df = pd.DataFrame(data)
+        self._draw_time_metric(ax1, results, "avg_wait_time", "Average Wait Time", "#3498db")
+        self._draw_time_metric(
+            ax2, results, "avg_turnaround_time", "Average Turnaround Time", "#9b59b6"
+        )
 
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+        fig.tight_layout()
+        filename = f"{self.output_dir}/03_performance_metrics.png"
+        self._save_figure(fig, filename)
 
-        # Average wait time
-        ax1.bar(df["Algorithm"], df["Avg Wait Time (s)"], color="#3498db", edgecolor="black")
-        ax1.set_title("Average Wait Time", fontsize=12, fontweight="bold")
-        ax1.set_ylabel("Time (seconds)", fontsize=11)
-        ax1.tick_params(axis="x", rotation=45)
-        ax1.grid(axis="y", alpha=0.3)
+    def plot_all_charts(self, results: Dict) -> None:
+        """All four charts in one 2x2 figure (a single render and PNG encode)"""
+        fig, axes = self._new_figure(2, 2, figsize=(16, 12))
 
-        # Average turnaround time
-        ax2.bar(df["Algorithm"], df["Avg Turnaround (s)"], color="#9b59b6", edgecolor="black")
-        ax2.set_title("Average Turnaround Time", fontsize=12, fontweight="bold")
-        ax2.set_ylabel("Time (seconds)", fontsize=11)
-        ax2.tick_params(axis="x", rotation=45)
-        ax2.grid(axis="y", alpha=0.3)
+        self._draw_energy(axes[0, 0], results)
+        self._draw_co2(axes[0, 1], results)
+        self._draw_time_metric(
+            axes[1, 0], results, "avg_wait_time", "Average Wait Time", "#3498db"
+        )
+        self._draw_time_metric(
+            axes[1, 1], results, "avg_turnaround_time", "Average Turnaround Time", "#9b59b6"
+        )
 
-        plt.tight_layout()
-        filename = f"{self.output_dir}/03_performance_metrics.png"
-        plt.savefig(filename, dpi=300, bbox_inches="tight")
-        print(f"✓ Saved: {filename}")
-        plt.close()
+        fig.tight_layout()
+        filename = f"{self.output_dir}/00_all_charts.png"
+        self._save_figure(fig, filename)
 
     def create_summary_table(self, results: Dict) -> pd.DataFrame:
         """Create and save a CSV summary of all metrics"""
@@ -132,8 +204,7 @@ class DataVisualizer:
         df = df.round(6)
 
         csv_filename = f"{self.output_dir}/04_results_summary.csv"
-        df.to_csv(csv_filename)
-        print(f"✓ Saved: {csv_filename}")
+        self._submit_write(csv_filename, df.to_csv, csv_filename)
 
         print("\n" + "=" * 80)
         print("COMPLETE RESULTS SUMMARY")
@@ -143,16 +214,26 @@ class DataVisualizer:
 
         return df
 
-    def generate_all_visualizations(self, results: Dict) -> None:
-        """Generate all charts and summary files"""
+    def generate_all_visualizations(self, results: Dict, wait: bool = True) -> None:
+        """
+        Generate all charts and summary files.
+        With wait=False the file writes are left running in the background;
+        call wait_for_writes() (then print_completion()) before relying on
+        the files.
+        """
         print("\n" + "=" * 60)
         print("GENERATING VISUALIZATIONS")
         print("=" * 60 + "\n")
 
-        self.plot_energy_comparison(results)
-        self.plot_co2_comparison(results)
-        self.plot_performance_metrics(results)
+        if config.FUSED_VISUALIZATION:
+            self.plot_all_charts(results)
+        else:
+            self.plot_energy_comparison(results)
+            self.plot_co2_comparison(results)
+            self.plot_performance_metrics(results)
         self.create_summary_table(results)
 
-        print("\n✓ All visualizations completed!")
-        print(f"✓ Results saved to: {os.path.abspath(self.output_dir)}")
+        if not wait:
+            return
+        self.wait_for_writes()
+        self.print_completion()